@@ -43,9 +43,7 @@ def _slice_diffs_inline(
     join_sql = q.inputs_join_sql(
         comparison._handles, comparison.table_id, comparison.by_columns
     )
-    predicate = " OR ".join(
-        q.diff_predicate(col, comparison.allow_both_na, "a", "b") for col in diff_cols
-    )
+    predicate = " OR ".join(comparison._diff_predicate_cache[col] for col in diff_cols)
     sql = f"""
     SELECT
       {base_alias}.*
@@ -57,11 +55,14 @@ def _slice_diffs_inline(
     return q.run_sql(comparison.connection, sql)
 
 
-def build_unmatched_keys_sql(comparison: "Comparison", table_name: str) -> str:
-    unmatched_keys_sql = comparison.unmatched_keys.sql_query()
-    by_cols = q.select_cols(comparison.by_columns, alias="keys")
-    table_filter = f"keys.{q.ident('table_name')} = {q.sql_literal(table_name)}"
-    return f"SELECT {by_cols} FROM ({unmatched_keys_sql}) AS keys WHERE {table_filter}"
+def unmatched_keys_relation(
+    comparison: "Comparison", table_name: str
+) -> duckdb.DuckDBPyRelation:
+    table_filter = f"{q.ident('table_name')} = {q.sql_literal(table_name)}"
+    relation = comparison.unmatched_keys.filter(table_filter).project(
+        q.select_cols(comparison.by_columns)
+    )
+    return relation
 
 
 def slice_unmatched(comparison: "Comparison", table: str) -> duckdb.DuckDBPyRelation:
@@ -69,14 +70,14 @@ def slice_unmatched(comparison: "Comparison", table: str) -> duckdb.DuckDBPyRela
     unmatched_lookup = comparison._unmatched_lookup
     if unmatched_lookup is not None and unmatched_lookup[table_name] == 0:
         return q.select_zero_from_table(comparison, table_name)
-    key_sql = build_unmatched_keys_sql(comparison, table_name)
-    return q.fetch_rows_by_keys(comparison, table_name, key_sql)
+    keys = unmatched_keys_relation(comparison, table_name)
+    return q.fetch_rows_by_keys(comparison, table_name, keys.sql_query())
 
 
 def slice_unmatched_both(comparison: "Comparison") -> duckdb.DuckDBPyRelation:
     out_cols = comparison.by_columns + comparison.common_columns
     select_cols = q.select_cols(out_cols, alias="base")
-    join_condition = q.join_condition(comparison.by_columns, "keys", "base")
+    join_condition = comparison._keys_join["base"]
     unmatched_lookup = comparison._unmatched_lookup
     table_names = [
         table_name
@@ -85,14 +86,13 @@ def slice_unmatched_both(comparison: "Comparison") -> duckdb.DuckDBPyRelation:
     ]
 
     def select_for(table_name: str) -> str:
-        unmatched_keys_sql = build_unmatched_keys_sql(comparison, table_name)
-        base_table = comparison._handles[table_name]
+        unmatched_keys_sql = unmatched_keys_relation(comparison, table_name).sql_query()
         return f"""
         SELECT
           {q.sql_literal(table_name)} AS table_name,
           {select_cols}
         FROM
-          {q.table_ref(base_table)} AS base
+          {comparison._table_refs[table_name]} AS base
           JOIN ({unmatched_keys_sql}) AS keys
             ON {join_condition}
         """
@@ -109,5 +109,5 @@ def slice_unmatched_both(comparison: "Comparison") -> duckdb.DuckDBPyRelation:
         """
         relation = base.query("base", sql)
         return relation
-    sql = " UNION ALL ".join(selects)
-    return q.run_sql(comparison.connection, sql)
+    relations = [q.run_sql(comparison.connection, sql) for sql in selects]
+    return q.union_all(relations)
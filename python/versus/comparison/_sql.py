@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import reduce
 from typing import TYPE_CHECKING, Any, List, Mapping, Optional, Sequence, Tuple, Union
 
 import duckdb
@@ -20,10 +21,14 @@ def col(alias: str, column: str) -> str:
     return f"{alias}.{ident(column)}"
 
 
-def table_ref(handle: _TableHandle) -> str:
+def table_ref(handle: _TableHandle, columns: Optional[Sequence[str]] = None) -> str:
     if handle.source_is_identifier:
-        return ident(handle.source_sql)
-    return f"({handle.source_sql})"
+        source = ident(handle.source_sql)
+    else:
+        source = f"({handle.source_sql})"
+    if columns is None:
+        return source
+    return f"(SELECT {select_cols(columns)} FROM {source})"
 
 
 def select_cols(columns: Sequence[str], alias: Optional[str] = None) -> str:
@@ -46,11 +51,12 @@ def inputs_join_sql(
     handles: Mapping[str, _TableHandle],
     table_id: Tuple[str, str],
     by_columns: List[str],
+    columns: Optional[Sequence[str]] = None,
 ) -> str:
     join_condition_sql = join_condition(by_columns, "a", "b")
     return (
-        f"{table_ref(handles[table_id[0]])} AS a\n"
-        f"  INNER JOIN {table_ref(handles[table_id[1]])} AS b\n"
+        f"{table_ref(handles[table_id[0]], columns)} AS a\n"
+        f"  INNER JOIN {table_ref(handles[table_id[1]], columns)} AS b\n"
         f"    ON {join_condition_sql}"
     )
 
@@ -83,6 +89,12 @@ def run_sql(
     return conn.sql(sql)
 
 
+def union_all(relations: Sequence[duckdb.DuckDBPyRelation]) -> duckdb.DuckDBPyRelation:
+    if not relations:
+        raise ComparisonError("Relation list must be non-empty")
+    return reduce(lambda left, right: left.union(right), relations)
+
+
 def require_diff_table(
     comparison: "Comparison",
 ) -> duckdb.DuckDBPyRelation:
@@ -95,8 +107,11 @@ def require_diff_table(
 def collect_diff_keys(comparison: "Comparison", columns: Sequence[str]) -> str:
     diff_table = require_diff_table(comparison)
     diff_table_sql = diff_table.sql_query()
-    by_cols = select_cols(comparison.by_columns, alias="diffs")
-    predicate = " OR ".join(f"diffs.{ident(column)}" for column in columns)
+    by_cols = comparison._by_select["diffs"]
+    if covers_all_diffs(comparison, columns):
+        predicate = "TRUE"
+    else:
+        predicate = " OR ".join(f"diffs.{ident(column)}" for column in columns)
     return f"""
     SELECT
       {by_cols}
@@ -107,6 +122,14 @@ def collect_diff_keys(comparison: "Comparison", columns: Sequence[str]) -> str:
     """
 
 
+def covers_all_diffs(comparison: "Comparison", columns: Sequence[str]) -> bool:
+    diff_lookup = comparison._diff_lookup
+    if diff_lookup is None:
+        return False
+    selected = set(columns)
+    return all(column in selected for column, n in diff_lookup.items() if n > 0)
+
+
 def fetch_rows_by_keys(
     comparison: "Comparison",
     table: str,
@@ -119,13 +142,13 @@ def fetch_rows_by_keys(
         if not columns:
             raise ComparisonError("Column list must be non-empty")
         select_cols_sql = select_cols(columns, alias="base")
-    join_condition_sql = join_condition(comparison.by_columns, "keys", "base")
+    join_condition_sql = comparison._keys_join["base"]
     sql = f"""
     SELECT
       {select_cols_sql}
     FROM
       ({key_sql}) AS keys
-      JOIN {table_ref(comparison._handles[table])} AS base
+      JOIN {comparison._table_refs[table]} AS base
         ON {join_condition_sql}
     """
     return run_sql(comparison.connection, sql)
@@ -136,12 +159,12 @@ def select_zero_from_table(
     table: str,
     columns: Optional[Sequence[str]] = None,
 ) -> duckdb.DuckDBPyRelation:
-    handle = comparison._handles[table]
+    source = comparison._table_refs[table]
     if columns is None:
-        sql = f"SELECT * FROM {table_ref(handle)} LIMIT 0"
+        sql = f"SELECT * FROM {source} LIMIT 0"
         return run_sql(comparison.connection, sql)
     if not columns:
         raise ComparisonError("Column list must be non-empty")
     select_cols_sql = select_cols(columns)
-    sql = f"SELECT {select_cols_sql} FROM {table_ref(handle)} LIMIT 0"
+    sql = f"SELECT {select_cols_sql} FROM {source} LIMIT 0"
     return run_sql(comparison.connection, sql)
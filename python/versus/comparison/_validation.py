@@ -188,7 +188,8 @@ def resolve_column_list(
         cols = normalize_column_list(columns, "column", allow_empty=True)
         if not cols:
             raise ComparisonError("`columns` must select at least one column")
-        missing = [col for col in cols if col not in comparison.common_columns]
+        common_set = set(comparison.common_columns)
+        missing = [col for col in cols if col not in common_set]
         if missing:
             raise ComparisonError(
                 f"Columns not part of the comparison: {', '.join(missing)}"
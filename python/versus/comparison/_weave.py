@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from itertools import chain
 from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
 import duckdb
@@ -34,6 +33,7 @@ def weave_diffs_wide(
 def weave_diffs_long(
     comparison: "Comparison",
     columns: Optional[Sequence[str]] = None,
+    ordered: bool = True,
 ) -> duckdb.DuckDBPyRelation:
     selected = v.resolve_column_list(comparison, columns)
     diff_cols = comparison._filter_diff_columns(selected)
@@ -52,7 +52,7 @@ def weave_diffs_long(
     if comparison._materialize_mode == "all":
         relation = _weave_diffs_long_with_keys(comparison, diff_cols)
     else:
-        relation = _weave_diffs_long_inline(comparison, diff_cols)
+        relation = _weave_diffs_long_inline(comparison, diff_cols, ordered)
     return relation
 
 
@@ -62,20 +62,13 @@ def _weave_select_parts(
     suffix: Tuple[str, str],
 ) -> List[str]:
     diff_set = set(diff_cols)
-
-    def parts_for(column: str) -> List[str]:
-        if column in diff_set:
-            return [
-                f"{q.col('a', column)} AS {q.ident(f'{column}{suffix[0]}')}",
-                f"{q.col('b', column)} AS {q.ident(f'{column}{suffix[1]}')}",
-            ]
-        return [q.col("a", column)]
-
-    by_parts = [q.col("a", column) for column in comparison.by_columns]
-    common_parts = list(
-        chain.from_iterable(parts_for(column) for column in comparison.common_columns)
-    )
-    return by_parts + common_parts
+    diff_mask = [column in diff_set for column in comparison.common_columns]
+    fragments = _wide_fragments(comparison, suffix)
+    common_parts = [
+        split if is_diff else shared
+        for (shared, split), is_diff in zip(fragments, diff_mask)
+    ]
+    return [comparison._by_select["a"], *common_parts]
 
 
 def _weave_diffs_wide_with_keys(
@@ -83,20 +76,22 @@ def _weave_diffs_wide_with_keys(
     diff_cols: Sequence[str],
     suffix: Optional[Tuple[str, str]],
 ) -> duckdb.DuckDBPyRelation:
-    table_a, table_b = comparison.table_id
-    suffix = resolve_suffix(suffix, comparison.table_id)
+    table_id = comparison.table_id
+    table_a, table_b = table_id
+    table_refs = comparison._table_refs
+    suffix = resolve_suffix(suffix, table_id)
     keys = q.collect_diff_keys(comparison, diff_cols)
     select_parts = _weave_select_parts(comparison, diff_cols, suffix)
-    join_a = q.join_condition(comparison.by_columns, "keys", "a")
-    join_b = q.join_condition(comparison.by_columns, "keys", "b")
+    join_a = comparison._keys_join["a"]
+    join_b = comparison._keys_join["b"]
     sql = f"""
     SELECT
       {", ".join(select_parts)}
     FROM
       ({keys}) AS keys
-      JOIN {q.table_ref(comparison._handles[table_a])} AS a
+      JOIN {table_refs[table_a]} AS a
         ON {join_a}
-      JOIN {q.table_ref(comparison._handles[table_b])} AS b
+      JOIN {table_refs[table_b]} AS b
         ON {join_b}
     """
     return q.run_sql(comparison.connection, sql)
@@ -107,15 +102,15 @@ def _weave_diffs_wide_inline(
     diff_cols: Sequence[str],
     suffix: Optional[Tuple[str, str]],
 ) -> duckdb.DuckDBPyRelation:
-    table_a, table_b = comparison.table_id
-    suffix = resolve_suffix(suffix, comparison.table_id)
+    by_columns = comparison.by_columns
+    table_id = comparison.table_id
+    handles = comparison._handles
+    suffix = resolve_suffix(suffix, table_id)
     select_parts = _weave_select_parts(comparison, diff_cols, suffix)
     join_sql = q.inputs_join_sql(
-        comparison._handles, comparison.table_id, comparison.by_columns
-    )
-    predicate = " OR ".join(
-        q.diff_predicate(col, comparison.allow_both_na, "a", "b") for col in diff_cols
+        handles, table_id, by_columns, by_columns + comparison.common_columns
     )
+    predicate = " OR ".join(comparison._diff_predicate_cache[col] for col in diff_cols)
     sql = f"""
     SELECT
       {", ".join(select_parts)}
@@ -130,18 +125,19 @@ def _weave_diffs_wide_inline(
 def _weave_diffs_long_with_keys(
     comparison: "Comparison", diff_cols: Sequence[str]
 ) -> duckdb.DuckDBPyRelation:
+    # The key set feeds both arms, so it is materialized once; sorting the
+    # stacked arms by key then table keeps each key's rows adjacent, which
+    # also serves ordered=False.
     table_a, table_b = comparison.table_id
+    table_refs = comparison._table_refs
     out_cols = comparison.by_columns + comparison.common_columns
     keys = q.collect_diff_keys(comparison, diff_cols)
     table_column = q.ident("table_name")
-    select_cols_a = q.select_cols(out_cols, alias="a")
-    select_cols_b = q.select_cols(out_cols, alias="b")
-    join_a = q.join_condition(comparison.by_columns, "keys", "a")
-    join_b = q.join_condition(comparison.by_columns, "keys", "b")
-    order_cols = q.select_cols(comparison.by_columns)
+    join_a = comparison._keys_join["a"]
+    join_b = comparison._keys_join["b"]
     sql = f"""
     WITH
-      keys AS (
+      keys AS MATERIALIZED (
         {keys}
       )
     SELECT
@@ -151,73 +147,82 @@ def _weave_diffs_long_with_keys(
       (
         SELECT
           0 AS __table_order,
-          '{table_a}' AS {table_column},
-          {select_cols_a}
+          {q.sql_literal(table_a)} AS {table_column},
+          {q.select_cols(out_cols, alias="a")}
         FROM
           keys
-          JOIN {q.table_ref(comparison._handles[table_a])} AS a
+          JOIN {table_refs[table_a]} AS a
             ON {join_a}
         UNION ALL
         SELECT
           1 AS __table_order,
-          '{table_b}' AS {table_column},
-          {select_cols_b}
+          {q.sql_literal(table_b)} AS {table_column},
+          {q.select_cols(out_cols, alias="b")}
         FROM
           keys
-          JOIN {q.table_ref(comparison._handles[table_b])} AS b
+          JOIN {table_refs[table_b]} AS b
             ON {join_b}
       ) AS stacked
     ORDER BY
-      {order_cols},
+      {q.select_cols(comparison.by_columns)},
       __table_order
     """
     return q.run_sql(comparison.connection, sql)
 
 
 def _weave_diffs_long_inline(
-    comparison: "Comparison", diff_cols: Sequence[str]
+    comparison: "Comparison", diff_cols: Sequence[str], ordered: bool
 ) -> duckdb.DuckDBPyRelation:
+    by_columns = comparison.by_columns
+    join_sql = q.inputs_join_sql(comparison._handles, comparison.table_id, by_columns)
+    predicate = " OR ".join(comparison._diff_predicate_cache[col] for col in diff_cols)
+    diffs_sql = f"""
+    SELECT
+      {_select_diffs_cols(comparison)}
+    FROM
+      {join_sql}
+    WHERE
+      {predicate}
+    {_order_by_keys(comparison, ordered)}
+    """
+    sql = _weave_long_sql(comparison, diffs_sql)
+    return q.run_sql(comparison.connection, sql)
+
+
+def _weave_long_sql(comparison: "Comparison", diffs_sql: str) -> str:
+    # Each differing key yields one row per table. Unnesting two-element
+    # lists keeps the pair adjacent in the (key-ordered) diffs stream, so
+    # only the diff rows are sorted rather than the stacked output. SQL does
+    # not guarantee that the ORDER BY inside `diffs` survives this outer
+    # projection; the woven order relies on DuckDB preserving it, which holds
+    # even with preserve_insertion_order disabled.
     table_a, table_b = comparison.table_id
-    out_cols = comparison.by_columns + comparison.common_columns
-    table_column = q.ident("table_name")
-    select_cols_a = q.select_cols(out_cols, alias="a")
-    select_cols_b = q.select_cols(out_cols, alias="b")
-    join_sql = q.inputs_join_sql(
-        comparison._handles, comparison.table_id, comparison.by_columns
+    by_columns = comparison.by_columns
+    common_columns = comparison.common_columns
+    table_label = (
+        f"UNNEST([{q.sql_literal(table_a)}, {q.sql_literal(table_b)}]) "
+        f"AS {q.ident('table_name')}"
     )
-    predicate = " OR ".join(
-        q.diff_predicate(col, comparison.allow_both_na, "a", "b") for col in diff_cols
-    )
-    order_cols = q.select_cols(comparison.by_columns)
+    by_cols = [
+        f"CAST(diffs.{q.ident(column)} AS {dtype}) AS {q.ident(column)}"
+        for column, dtype in zip(by_columns, _stacked_types(comparison, by_columns))
+    ]
+    unnest_cols = [
+        f"UNNEST(["
+        f"CAST(diffs.{q.ident(_side_column('a', column))} AS {dtype}), "
+        f"CAST(diffs.{q.ident(_side_column('b', column))} AS {dtype})"
+        f"]) AS {q.ident(column)}"
+        for column, dtype in zip(
+            common_columns, _stacked_types(comparison, common_columns)
+        )
+    ]
     sql = f"""
     SELECT
-      {table_column},
-      {q.select_cols(out_cols)}
+      {", ".join([table_label, *by_cols, *unnest_cols])}
     FROM
-      (
-        SELECT
-          0 AS __table_order,
-          '{table_a}' AS {table_column},
-          {select_cols_a}
-        FROM
-          {join_sql}
-        WHERE
-          {predicate}
-        UNION ALL
-        SELECT
-          1 AS __table_order,
-          '{table_b}' AS {table_column},
-          {select_cols_b}
-        FROM
-          {join_sql}
-        WHERE
-          {predicate}
-      ) AS stacked
-    ORDER BY
-      {order_cols},
-      __table_order
+      ({diffs_sql}) AS diffs
     """
-    return q.run_sql(comparison.connection, sql)
+    return sql
 
 
 # ------- helpers
@@ -235,3 +240,58 @@ def resolve_suffix(
     if suffix[0] == suffix[1]:
         raise e.ComparisonError("Entries of `suffix` must be distinct")
     return (suffix[0], suffix[1])
+
+
+def _wide_fragments(
+    comparison: "Comparison", suffix: Tuple[str, str]
+) -> List[Tuple[str, str]]:
+    cache = comparison._wide_fragment_cache
+    if suffix not in cache:
+        suffix_a, suffix_b = suffix
+        cache[suffix] = [
+            (
+                q.col("a", column),
+                (
+                    f"{q.col('a', column)} AS {q.ident(column + suffix_a)}, "
+                    f"{q.col('b', column)} AS {q.ident(column + suffix_b)}"
+                ),
+            )
+            for column in comparison.common_columns
+        ]
+    return cache[suffix]
+
+
+def _order_by_keys(comparison: "Comparison", ordered: bool) -> str:
+    if not ordered:
+        return ""
+    return f"ORDER BY {comparison._by_select['a']}"
+
+
+def _side_column(alias: str, column: str) -> str:
+    return f"{alias}.{column}"
+
+
+def _select_diffs_cols(comparison: "Comparison") -> str:
+    side_parts = [
+        f"{q.col(alias, column)} AS {q.ident(_side_column(alias, column))}"
+        for alias in ("a", "b")
+        for column in comparison.common_columns
+    ]
+    select_sql = ", ".join([comparison._by_select["a"], *side_parts])
+    return select_sql
+
+
+def _stacked_types(comparison: "Comparison", columns: Sequence[str]) -> List[str]:
+    # Bind (without running) the UNION ALL of both inputs so the woven
+    # columns take the same supertypes a stacked query would produce.
+    cache = comparison._stacked_type_cache
+    if not cache:
+        out_cols = comparison.by_columns + comparison.common_columns
+        relations = [
+            q.select_zero_from_table(comparison, table, out_cols)
+            for table in comparison.table_id
+        ]
+        types = q.union_all(relations).types
+        cache.update(zip(out_cols, (str(dtype) for dtype in types)))
+    stacked_types = [cache[column] for column in columns]
+    return stacked_types
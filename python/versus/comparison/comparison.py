@@ -47,6 +47,10 @@ class Comparison:
         self.inputs = {
             identifier: handle.relation for identifier, handle in self._handles.items()
         }
+        self._table_refs = {
+            identifier: q.table_ref(handle)
+            for identifier, handle in self._handles.items()
+        }
         self.table_id = table_id
         self.by_columns = by_columns
         self.allow_both_na = allow_both_na
@@ -75,6 +79,20 @@ class Comparison:
             on_materialize=self._store_unmatched_lookup,
         )
         self.common_columns = common_columns
+        self._by_select = {
+            alias: q.select_cols(by_columns, alias=alias)
+            for alias in ("a", "keys", "diffs")
+        }
+        self._keys_join = {
+            alias: q.join_condition(by_columns, "keys", alias)
+            for alias in ("a", "b", "base")
+        }
+        self._wide_fragment_cache: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self._stacked_type_cache: Dict[str, str] = {}
+        self._diff_predicate_cache = {
+            column: q.diff_predicate(column, allow_both_na, "a", "b")
+            for column in common_columns
+        }
         self.table_columns = table_columns
         if materialize_mode == "all" and diff_table is None:
             raise e.ComparisonError("Diff table is required when materialize='all'.")
@@ -346,6 +364,7 @@ class Comparison:
     def weave_diffs_long(
         self,
         columns: Optional[Sequence[str]] = None,
+        ordered: bool = True,
     ) -> duckdb.DuckDBPyRelation:
         """Return a long view of differing rows stacked by table.
 
@@ -353,6 +372,10 @@ class Comparison:
         ----------
         columns : sequence of str, optional
             Columns to compare. Defaults to all comparable columns.
+        ordered : bool, default True
+            If True, sort the output by the key columns. If False, the keys
+            may come back in any order; each key's table A and B rows still
+            stay adjacent.
 
         Returns
         -------
@@ -378,7 +401,7 @@ class Comparison:
         │ b          │ Hornet 4 Drive │         21.4 │     6 │   258 │   110 │         3.08 │         3.22 │     1 │
         └────────────┴────────────────┴──────────────┴───────┴───────┴───────┴──────────────┴──────────────┴───────┘
         """
-        return w.weave_diffs_long(self, columns)
+        return w.weave_diffs_long(self, columns, ordered)
 
     def summary(self) -> duckdb.DuckDBPyRelation:
         """Summarize which difference categories are present.
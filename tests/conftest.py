@@ -1,5 +1,29 @@
 import sys
 from pathlib import Path
 
+import duckdb
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1] / "python"
 sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def duck():
+    con = duckdb.connect()
+    yield con
+    con.close()
+
+
+@pytest.fixture
+def con(duck):
+    cursor = duck.cursor()
+    yield cursor
+    cursor.close()
+
+
+@pytest.fixture(scope="session")
+def cars(duck):
+    from versus import examples
+
+    return examples.example_cars_a(duck), examples.example_cars_b(duck)
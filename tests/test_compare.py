@@ -2,7 +2,13 @@ from typing import Any, cast
 
 import duckdb
 import pytest
-from versus import ComparisonError, compare, examples
+from versus import ComparisonError, compare
+
+VALUE_COLUMN_FILTER = "\"column\" = 'value'"
+MPG_COLUMN_FILTER = "\"column\" = 'mpg'"
+UNMATCHED_COUNTS_NO_OVERLAP = frozenset({("a", 2), ("b", 2)})
+UNMATCHED_COUNTS_NONE = frozenset({("a", 0), ("b", 0)})
+UNMATCHED_EXTRA_COLS = frozenset({("a", "extra_a"), ("b", "extra_b")})
 
 
 def rel_height(rel):
@@ -10,13 +16,12 @@ def rel_height(rel):
 
 
 def rel_values(rel, column):
-    idx = rel.columns.index(column)
-    return [row[idx] for row in rel.fetchall()]
+    return [row[0] for row in rel.project(f'"{column}"').fetchall()]
 
 
 def rel_first(rel, column):
-    values = rel_values(rel, column)
-    return values[0] if values else None
+    row = rel.project(f'"{column}"').limit(1).fetchone()
+    return row[0] if row else None
 
 
 def rel_dicts(rel):
@@ -28,8 +33,7 @@ def rel_dtypes(rel):
     return [str(dtype) for dtype in rel.dtypes]
 
 
-def build_connection():
-    con = duckdb.connect()
+def build_relations(con):
     rel_a = con.sql(
         """
         SELECT
@@ -56,17 +60,17 @@ def build_connection():
           ) AS t(id, value, extra)
         """
     )
-    return con, rel_a, rel_b
+    return rel_a, rel_b
 
 
-def comparison_from_sql(sql_a: str, sql_b: str, *, by, **kwargs):
-    con = duckdb.connect()
+def comparison_from_sql(con, sql_a: str, sql_b: str, *, by, **kwargs):
     rel_a = con.sql(sql_a)
     rel_b = con.sql(sql_b)
     return compare(rel_a, rel_b, by=by, con=con, **kwargs)
 
 
-def identical_comparison():
+@pytest.fixture(scope="module")
+def identical_comp(duck):
     sql = """
         SELECT
           *
@@ -77,83 +81,80 @@ def identical_comparison():
               (2, 20)
           ) AS t(id, value)
     """
-    return comparison_from_sql(sql, sql, by=["id"])
+    comp = comparison_from_sql(duck, sql, sql, by=["id"])
+    yield comp
+    comp.close()
 
 
-def test_compare_summary():
-    con, rel_a, rel_b = build_connection()
-    comp = compare(rel_a, rel_b, by=["id"], con=con)
-    assert rel_values(comp.tables, "nrow") == [3, 3]
-    value_row = rel_dicts(comp.intersection.filter("\"column\" = 'value'"))[0]
+@pytest.fixture(scope="module")
+def basic_relations(duck):
+    return build_relations(duck)
+
+
+@pytest.fixture(scope="module")
+def basic_comp(duck, basic_relations):
+    rel_a, rel_b = basic_relations
+    comp = compare(rel_a, rel_b, by=["id"], con=duck)
+    yield comp
+    comp.close()
+
+
+def test_compare_summary(basic_comp):
+    assert rel_values(basic_comp.tables, "nrow") == [3, 3]
+    value_row = rel_dicts(basic_comp.intersection.filter(VALUE_COLUMN_FILTER))[0]
     assert value_row["n_diffs"] == 1
 
 
-def test_inputs_property_exposes_relations():
-    con, rel_a, rel_b = build_connection()
-    comp = compare(rel_a, rel_b, by=["id"], con=con)
-    inputs = comp.inputs
+def test_inputs_property_exposes_relations(basic_comp):
+    inputs = basic_comp.inputs
     assert isinstance(inputs, dict)
     assert "a" in inputs and "b" in inputs
     assert "id" in inputs["a"].columns
-    comp.close()
 
 
-def test_compare_accepts_pandas_polars_frames():
+def test_compare_accepts_pandas_polars_frames(con):
     pandas = pytest.importorskip("pandas")
     polars = pytest.importorskip("polars")
-    con = duckdb.connect()
     df_a = pandas.DataFrame({"id": [1, 2], "value": [10, 20]})
     df_b = polars.DataFrame({"id": [1, 2], "value": [10, 22]})
     comp = compare(df_a, df_b, by=["id"], con=con)
-    value_row = rel_dicts(comp.intersection.filter("\"column\" = 'value'"))[0]
+    value_row = rel_dicts(comp.intersection.filter(VALUE_COLUMN_FILTER))[0]
     assert value_row["n_diffs"] == 1
-    comp.close()
-    con.close()
 
 
-def test_value_diffs_and_slice():
-    con, rel_a, rel_b = build_connection()
-    comp = compare(rel_a, rel_b, by=["id"], con=con)
-    diffs = comp.value_diffs("value")
+def test_value_diffs_and_slice(basic_comp):
+    diffs = basic_comp.value_diffs("value")
     assert rel_first(diffs, "id") == 2
-    rows = comp.slice_diffs("a", ["value"])
+    rows = basic_comp.slice_diffs("a", ["value"])
     assert rel_first(rows, "id") == 2
 
 
-def test_weave_wide():
-    con, rel_a, rel_b = build_connection()
-    comp = compare(rel_a, rel_b, by=["id"], con=con)
-    wide = comp.weave_diffs_wide(["value"])
+def test_weave_wide(basic_comp):
+    wide = basic_comp.weave_diffs_wide(["value"])
     assert "value_a" in wide.columns and "value_b" in wide.columns
 
 
-def test_slice_unmatched():
-    con, rel_a, rel_b = build_connection()
-    comp = compare(rel_a, rel_b, by=["id"], con=con)
-    unmatched = comp.slice_unmatched("a")
+def test_slice_unmatched(basic_comp):
+    unmatched = basic_comp.slice_unmatched("a")
     assert rel_first(unmatched, "id") == 1
-    comp.close()
 
 
 @pytest.mark.parametrize("module_name", ["pandas", "polars"])
-def test_compare_accepts_dataframes(module_name):
+def test_compare_accepts_dataframes(con, module_name):
     module = pytest.importorskip(module_name)
     df_a = module.DataFrame({"id": [1, 2, 3], "value": [10, 20, 30]})
     df_b = module.DataFrame({"id": [2, 3, 4], "value": [22, 30, 40]})
-    con = duckdb.connect()
     comp = compare(df_a, df_b, by=["id"], con=con)
     diffs = comp.value_diffs("value")
     assert rel_first(diffs, "id") == 2
-    comp.close()
-    con.close()
 
 
 @pytest.mark.parametrize("materialize", ["all", "summary", "none"])
-def test_materialize_modes_helpers(materialize):
-    con, rel_a, rel_b = build_connection()
+def test_materialize_modes_helpers(con, materialize):
+    rel_a, rel_b = build_relations(con)
     comp = compare(rel_a, rel_b, by=["id"], con=con, materialize=materialize)
     assert rel_values(comp.tables, "nrow") == [3, 3]
-    diffs_row = rel_dicts(comp.intersection.filter("\"column\" = 'value'"))[0]
+    diffs_row = rel_dicts(comp.intersection.filter(VALUE_COLUMN_FILTER))[0]
     assert diffs_row["n_diffs"] == 1
     diffs = comp.value_diffs("value")
     assert rel_first(diffs, "id") == 2
@@ -169,8 +170,6 @@ def test_materialize_modes_helpers(materialize):
     assert rel_first(unmatched, "id") == 1
     unmatched_both = comp.slice_unmatched_both()
     assert "table_name" in unmatched_both.columns
-    comp.close()
-    con.close()
 
 
 @pytest.mark.parametrize(
@@ -181,8 +180,10 @@ def test_materialize_modes_helpers(materialize):
         ("none", False, False),
     ],
 )
-def test_materialize_modes_state(materialize, summary_materialized, has_diff_table):
-    con, rel_a, rel_b = build_connection()
+def test_materialize_modes_state(
+    con, materialize, summary_materialized, has_diff_table
+):
+    rel_a, rel_b = build_relations(con)
     comp = compare(rel_a, rel_b, by=["id"], con=con, materialize=materialize)
     assert comp.intersection.materialized is summary_materialized
     assert comp.unmatched_rows.materialized is summary_materialized
@@ -193,12 +194,9 @@ def test_materialize_modes_state(materialize, summary_materialized, has_diff_tab
         _ = str(comp)
         assert comp._diff_lookup is not None
         assert comp._unmatched_lookup is not None
-    comp.close()
-    con.close()
 
 
-def test_summary_reports_difference_categories():
-    con = duckdb.connect()
+def test_summary_reports_difference_categories(con):
     rel_a = con.sql(
         """
         SELECT
@@ -231,26 +229,18 @@ def test_summary_reports_difference_categories():
         ("unmatched_rows", True),
         ("type_diffs", True),
     ]
-    comp.close()
 
 
-def test_summary_repr_shows_full_difference_labels():
-    con = duckdb.connect()
-    comp = compare(
-        examples.example_cars_a(con),
-        examples.example_cars_b(con),
-        by=["car"],
-        con=con,
-    )
+def test_summary_repr_shows_full_difference_labels(duck, cars):
+    cars_a, cars_b = cars
+    comp = compare(cars_a, cars_b, by=["car"], con=duck)
     rendered = str(comp.summary())
     assert "unmatched_cols" in rendered
     assert "unmatched_rows" in rendered
     comp.close()
-    con.close()
 
 
-def test_duplicate_by_raises():
-    con = duckdb.connect()
+def test_duplicate_by_raises(con):
     rel_dup = con.sql(
         """
         SELECT
@@ -278,45 +268,34 @@ def test_duplicate_by_raises():
         compare(rel_dup, rel_other, by=["id"], con=con)
 
 
-def test_examples_available():
-    con = duckdb.connect()
-    comp = compare(
-        examples.example_cars_a(con),
-        examples.example_cars_b(con),
-        by=["car"],
-        con=con,
-    )
-    assert rel_dicts(comp.intersection.filter("\"column\" = 'mpg'"))[0]["n_diffs"] == 2
+def test_examples_available(duck, cars):
+    cars_a, cars_b = cars
+    comp = compare(cars_a, cars_b, by=["car"], con=duck)
+    assert rel_dicts(comp.intersection.filter(MPG_COLUMN_FILTER))[0]["n_diffs"] == 2
     comp.close()
-    con.close()
 
 
-def test_compare_errors_when_by_column_missing():
-    con = duckdb.connect()
+def test_compare_errors_when_by_column_missing(con):
     rel_a = con.sql("SELECT 1 AS id, 10 AS value")
     rel_b = con.sql("SELECT 1 AS other_id, 10 AS value")
     with pytest.raises(ComparisonError):
         compare(rel_a, rel_b, by=["id"], con=con)
 
 
-def test_compare_errors_on_string_inputs():
-    con = duckdb.connect()
+def test_compare_errors_on_string_inputs(con):
     rel = con.sql("SELECT 1 AS id")
     with pytest.raises(ComparisonError, match=r"String inputs are not supported"):
         compare(cast(Any, "SELECT 1 AS id"), rel, by=["id"], con=con)
     with pytest.raises(ComparisonError, match=r"String inputs are not supported"):
         compare(rel, cast(Any, "SELECT 1 AS id"), by=["id"], con=con)
-    con.close()
 
 
-def test_compare_errors_on_duplicate_column_names():
+def test_compare_errors_on_duplicate_column_names(con):
     pandas = pytest.importorskip("pandas")
     df_a = pandas.DataFrame([[1, 2]], columns=["id", "id"])
     df_b = pandas.DataFrame([[1, 2]], columns=["id", "value"])
-    con = duckdb.connect()
     with pytest.raises(ComparisonError, match=r"duplicate column names"):
         compare(df_a, df_b, by=["id"], con=con)
-    con.close()
 
 
 def test_compare_errors_on_relations_from_non_default_connection():
@@ -335,45 +314,41 @@ def test_compare_errors_on_relations_from_non_default_connection():
         other_conn.close()
 
 
-def test_compare_errors_when_table_id_invalid_length():
-    con, rel_a, rel_b = build_connection()
-    with pytest.raises(ComparisonError):
-        bad_table_id = cast(Any, ["x"])
-        compare(rel_a, rel_b, by=["id"], table_id=bad_table_id, con=con)
-
-
-def test_compare_errors_when_table_id_duplicates():
-    con, rel_a, rel_b = build_connection()
-    with pytest.raises(ComparisonError):
-        compare(rel_a, rel_b, by=["id"], table_id=("dup", "dup"), con=con)
-
-
-def test_compare_errors_when_table_id_blank():
-    con, rel_a, rel_b = build_connection()
-    with pytest.raises(ComparisonError):
-        compare(rel_a, rel_b, by=["id"], table_id=(" ", "b"), con=con)
-
-
-def test_compare_errors_when_materialize_invalid():
-    con, rel_a, rel_b = build_connection()
-    with pytest.raises(ComparisonError):
-        compare(rel_a, rel_b, by=["id"], con=con, materialize=cast(Any, "nope"))
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"table_id": ["x"]},
+        {"table_id": ("dup", "dup")},
+        {"table_id": (" ", "b")},
+        {"materialize": "nope"},
+        {"materialize": True},
+    ],
+    ids=[
+        "table_id_invalid_length",
+        "table_id_duplicates",
+        "table_id_blank",
+        "materialize_unknown",
+        "materialize_not_string",
+    ],
+)
+def test_compare_errors_on_invalid_arguments(duck, basic_relations, kwargs):
+    rel_a, rel_b = basic_relations
     with pytest.raises(ComparisonError):
-        compare(rel_a, rel_b, by=["id"], con=con, materialize=cast(Any, True))
-    con.close()
+        compare(rel_a, rel_b, by=["id"], con=duck, **cast(Any, kwargs))
 
 
-def test_intersection_empty_when_no_value_columns():
+def test_intersection_empty_when_no_value_columns(con):
     sql = "SELECT * FROM (VALUES (1, 10)) AS t(id, value)"
-    comp = comparison_from_sql(sql, sql, by=["id", "value"])
+    comp = comparison_from_sql(con, sql, sql, by=["id", "value"])
     assert comp.common_columns == []
     assert rel_height(comp.intersection) == 0
     assert comp.intersection.columns == ["column", "n_diffs", "type_a", "type_b"]
 
 
-def test_compare_coerce_false_detects_type_mismatch():
+def test_compare_coerce_false_detects_type_mismatch(con):
     with pytest.raises(ComparisonError):
         comparison_from_sql(
+            con,
             """
             SELECT
               *
@@ -399,19 +374,18 @@ def test_compare_coerce_false_detects_type_mismatch():
         )
 
 
-def test_allow_both_na_controls_diff_detection():
+def test_allow_both_na_controls_diff_detection(con):
     sql_a = "SELECT * FROM (VALUES (1, NULL), (2, 3)) AS t(id, value)"
     sql_b = "SELECT * FROM (VALUES (1, NULL), (2, NULL)) AS t(id, value)"
-    comp_true = comparison_from_sql(sql_a, sql_b, by=["id"], allow_both_na=True)
-    comp_false = comparison_from_sql(sql_a, sql_b, by=["id"], allow_both_na=False)
+    comp_true = comparison_from_sql(con, sql_a, sql_b, by=["id"], allow_both_na=True)
+    comp_false = comparison_from_sql(con, sql_a, sql_b, by=["id"], allow_both_na=False)
     assert rel_height(comp_true.value_diffs("value")) == 1
     assert rel_height(comp_false.value_diffs("value")) == 2
-    comp_true.close()
-    comp_false.close()
 
 
-def test_compare_handles_no_common_rows():
+def test_compare_handles_no_common_rows(con):
     comp = comparison_from_sql(
+        con,
         "SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)",
         "SELECT * FROM (VALUES (3, 30), (4, 40)) AS t(id, value)",
         by=["id"],
@@ -422,12 +396,12 @@ def test_compare_handles_no_common_rows():
         (row["table_name"], row["n_unmatched"])
         for row in rel_dicts(comp.unmatched_rows)
     }
-    assert counts == {("a", 2), ("b", 2)}
-    comp.close()
+    assert counts == UNMATCHED_COUNTS_NO_OVERLAP
 
 
-def test_compare_reports_unmatched_columns():
+def test_compare_reports_unmatched_columns(con):
     comp = comparison_from_sql(
+        con,
         "SELECT * FROM (VALUES (1, 1, 99), (2, 2, 99)) AS t(id, value, extra_a)",
         "SELECT * FROM (VALUES (1, 1, 88), (2, 3, 88)) AS t(id, value, extra_b)",
         by=["id"],
@@ -435,105 +409,89 @@ def test_compare_reports_unmatched_columns():
     cols = {
         (row["table_name"], row["column"]) for row in rel_dicts(comp.unmatched_cols)
     }
-    assert cols == {("a", "extra_a"), ("b", "extra_b")}
-    comp.close()
+    assert cols == UNMATCHED_EXTRA_COLS
 
 
-def test_value_diffs_empty_structure():
-    comp = identical_comparison()
-    rel = comp.value_diffs("value")
+def test_value_diffs_empty_structure(identical_comp):
+    rel = identical_comp.value_diffs("value")
     assert rel_height(rel) == 0
     assert rel.columns == ["value_a", "value_b", "id"]
     assert rel_dtypes(rel) == ["INTEGER", "INTEGER", "INTEGER"]
-    comp.close()
 
 
-def test_value_diffs_stacked_empty_structure():
-    comp = identical_comparison()
-    rel = comp.value_diffs_stacked()
+def test_value_diffs_stacked_empty_structure(identical_comp):
+    rel = identical_comp.value_diffs_stacked()
     assert rel_height(rel) == 0
     assert rel.columns == [
         "column",
-        f"val_{comp.table_id[0]}",
-        f"val_{comp.table_id[1]}",
-        *comp.by_columns,
+        f"val_{identical_comp.table_id[0]}",
+        f"val_{identical_comp.table_id[1]}",
+        *identical_comp.by_columns,
     ]
     assert rel_dtypes(rel) == ["VARCHAR", "INTEGER", "INTEGER", "INTEGER"]
-    comp.close()
 
 
-def test_slice_diffs_empty_structure():
-    comp = identical_comparison()
-    rel = comp.slice_diffs("a", ["value"])
+def test_slice_diffs_empty_structure(identical_comp):
+    rel = identical_comp.slice_diffs("a", ["value"])
     assert rel_height(rel) == 0
     assert rel.columns == ["id", "value"]
     assert rel_dtypes(rel) == ["INTEGER", "INTEGER"]
-    comp.close()
 
 
-def test_weave_wide_empty_structure():
-    comp = identical_comparison()
-    rel = comp.weave_diffs_wide(["value"])
+def test_weave_wide_empty_structure(identical_comp):
+    rel = identical_comp.weave_diffs_wide(["value"])
     assert rel_height(rel) == 0
     assert rel.columns == ["id", "value"]
     assert rel_dtypes(rel) == ["INTEGER", "INTEGER"]
-    comp.close()
 
 
-def test_weave_long_empty_structure():
-    comp = identical_comparison()
-    rel = comp.weave_diffs_long(["value"])
+def test_weave_long_empty_structure(identical_comp):
+    rel = identical_comp.weave_diffs_long(["value"])
     assert rel_height(rel) == 0
     assert rel.columns == ["table_name", "id", "value"]
     assert rel_dtypes(rel) == ["VARCHAR", "INTEGER", "INTEGER"]
-    comp.close()
 
 
-def test_slice_unmatched_empty_structure():
-    comp = identical_comparison()
-    rel = comp.slice_unmatched("a")
+def test_slice_unmatched_empty_structure(identical_comp):
+    rel = identical_comp.slice_unmatched("a")
     assert rel_height(rel) == 0
     assert rel.columns == ["id", "value"]
     assert rel_dtypes(rel) == ["INTEGER", "INTEGER"]
-    comp.close()
 
 
-def test_slice_unmatched_both_empty_structure():
-    comp = identical_comparison()
-    rel = comp.slice_unmatched_both()
+def test_slice_unmatched_both_empty_structure(identical_comp):
+    rel = identical_comp.slice_unmatched_both()
     assert rel_height(rel) == 0
     assert rel.columns == ["table_name", "id", "value"]
     assert rel_dtypes(rel) == ["VARCHAR", "INTEGER", "INTEGER"]
-    comp.close()
 
 
-def test_unmatched_cols_empty_preserves_types():
-    comp = identical_comparison()
-    assert rel_dtypes(comp.unmatched_cols) == ["VARCHAR", "VARCHAR", "VARCHAR"]
-    comp.close()
+def test_unmatched_cols_empty_preserves_types(identical_comp):
+    assert rel_dtypes(identical_comp.unmatched_cols) == [
+        "VARCHAR",
+        "VARCHAR",
+        "VARCHAR",
+    ]
 
 
-def test_unmatched_keys_empty_structure():
-    comp = identical_comparison()
-    assert rel_height(comp.unmatched_keys) == 0
-    assert rel_dtypes(comp.unmatched_keys) == ["VARCHAR", "INTEGER"]
-    comp.close()
+def test_unmatched_keys_empty_structure(identical_comp):
+    assert rel_height(identical_comp.unmatched_keys) == 0
+    assert rel_dtypes(identical_comp.unmatched_keys) == ["VARCHAR", "INTEGER"]
 
 
-def test_unmatched_rows_empty_structure():
-    comp = identical_comparison()
-    assert rel_height(comp.unmatched_rows) == 2
-    assert rel_dtypes(comp.unmatched_rows) == ["VARCHAR", "BIGINT"]
+def test_unmatched_rows_empty_structure(identical_comp):
+    assert rel_height(identical_comp.unmatched_rows) == 2
+    assert rel_dtypes(identical_comp.unmatched_rows) == ["VARCHAR", "BIGINT"]
     counts = {
         (row["table_name"], row["n_unmatched"])
-        for row in rel_dicts(comp.unmatched_rows)
+        for row in rel_dicts(identical_comp.unmatched_rows)
     }
-    assert counts == {("a", 0), ("b", 0)}
-    comp.close()
+    assert counts == UNMATCHED_COUNTS_NONE
 
 
-def test_unmatched_rows_order_matches_table_id():
+def test_unmatched_rows_order_matches_table_id(con):
     comp = comparison_from_sql(
+        con,
         "SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)",
         "SELECT * FROM (VALUES (2, 20), (3, 30)) AS t(id, value)",
         by=["id"],
@@ -541,16 +499,14 @@ def test_unmatched_rows_order_matches_table_id():
     )
     rows = rel_dicts(comp.unmatched_rows)
     assert [row["table_name"] for row in rows] == ["right", "left"]
-    comp.close()
 
 
-def test_comparison_repr_snapshot():
-    con = duckdb.connect()
+def test_comparison_repr_snapshot(con):
     con.execute(
-        "CREATE OR REPLACE TABLE foo AS SELECT * FROM (VALUES (1, 10, 'x'), (2, 20, 'y')) AS t(id, value, extra)"
+        "CREATE TEMP TABLE foo AS SELECT * FROM (VALUES (1, 10, 'x'), (2, 20, 'y')) AS t(id, value, extra)"
     )
     con.execute(
-        "CREATE OR REPLACE TABLE bar AS SELECT * FROM (VALUES (2, 22, 'y'), (3, 30, 'z')) AS t(id, value, extra)"
+        "CREATE TEMP TABLE bar AS SELECT * FROM (VALUES (2, 22, 'y'), (3, 30, 'z')) AS t(id, value, extra)"
     )
     comp = compare(con.table("foo"), con.table("bar"), by=["id"], con=con)
     text = repr(comp)
@@ -558,4 +514,3 @@ def test_comparison_repr_snapshot():
     assert "by=" in text
     assert "intersection=" in text
     assert "unmatched_rows=" in text
-    comp.close()
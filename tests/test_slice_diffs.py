@@ -1,37 +1,33 @@
 from collections import Counter
 
-import duckdb
 import pytest
 from versus import ComparisonError, compare
 
 
 def rel_values(rel, column):
-    idx = rel.columns.index(column)
-    return [row[idx] for row in rel.fetchall()]
+    return [row[0] for row in rel.project(f'"{column}"').fetchall()]
 
 
 def rel_height(rel):
     return rel.aggregate("COUNT(*) AS n").fetchone()[0]
 
 
-@pytest.fixture
-def comparison_for_slice():
-    con = duckdb.connect()
+@pytest.fixture(scope="module")
+def comparison_for_slice(duck):
     comp = compare(
-        con.sql(
+        duck.sql(
             "SELECT * FROM (VALUES (1, 10, 1, 'same'), (2, 20, 1, 'same'), (3, 30, 1, 'same')) "
             "AS t(id, value, other, note)"
         ),
-        con.sql(
+        duck.sql(
             "SELECT * FROM (VALUES (1, 10, 1, 'same'), (2, 25, 2, 'same'), (3, 35, 1, 'same')) "
             "AS t(id, value, other, note)"
         ),
         by=["id"],
-        con=con,
+        con=duck,
     )
     yield comp
     comp.close()
-    con.close()
 
 
 def test_slice_diffs_returns_rows(comparison_for_slice):
@@ -1,25 +1,28 @@
-import duckdb
 import pytest
 from versus import ComparisonError, compare
 
+DEFAULT_TABLE_IDS = frozenset({"a", "b"})
+CUSTOM_TABLE_IDS = frozenset({"left", "right"})
+
 
 def rel_values(rel, column):
-    idx = rel.columns.index(column)
-    return [row[idx] for row in rel.fetchall()]
+    return [row[0] for row in rel.project(f'"{column}"').fetchall()]
+
 
+def rel_distinct(rel, column):
+    return {row[0] for row in rel.project(f'"{column}"').distinct().fetchall()}
 
-@pytest.fixture
-def comparison_with_unmatched():
-    con = duckdb.connect()
+
+@pytest.fixture(scope="module")
+def comparison_with_unmatched(duck):
     comp = compare(
-        con.sql("SELECT * FROM (VALUES (1, 10), (2, 20), (3, 30)) AS t(id, value)"),
-        con.sql("SELECT * FROM (VALUES (2, 20), (3, 30), (4, 40)) AS t(id, value)"),
+        duck.sql("SELECT * FROM (VALUES (1, 10), (2, 20), (3, 30)) AS t(id, value)"),
+        duck.sql("SELECT * FROM (VALUES (2, 20), (3, 30), (4, 40)) AS t(id, value)"),
         by=["id"],
-        con=con,
+        con=duck,
     )
     yield comp
     comp.close()
-    con.close()
 
 
 def test_slice_unmatched_returns_rows(comparison_with_unmatched):
@@ -29,7 +32,7 @@ def test_slice_unmatched_returns_rows(comparison_with_unmatched):
 
 def test_slice_unmatched_both_includes_table_label(comparison_with_unmatched):
     out = comparison_with_unmatched.slice_unmatched_both()
-    assert set(rel_values(out, "table_name")) == {"a", "b"}
+    assert rel_distinct(out, "table_name") == DEFAULT_TABLE_IDS
     assert "id" in out.columns
 
 
@@ -38,8 +41,7 @@ def test_slice_unmatched_errors_on_invalid_table(comparison_with_unmatched):
         comparison_with_unmatched.slice_unmatched("missing")
 
 
-def test_slice_unmatched_respects_custom_table_id():
-    con = duckdb.connect()
+def test_slice_unmatched_respects_custom_table_id(con):
     comp = compare(
         con.sql("SELECT * FROM (VALUES (1, 10), (2, 20), (3, 30)) AS t(id, value)"),
         con.sql("SELECT * FROM (VALUES (2, 20), (3, 30), (4, 40)) AS t(id, value)"),
@@ -50,6 +52,4 @@ def test_slice_unmatched_respects_custom_table_id():
     left = comp.slice_unmatched("left")
     assert rel_values(left, "id") == [1]
     both = comp.slice_unmatched_both()
-    assert set(rel_values(both, "table_name")) == {"left", "right"}
-    comp.close()
-    con.close()
+    assert rel_distinct(both, "table_name") == CUSTOM_TABLE_IDS
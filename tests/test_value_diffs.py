@@ -1,21 +1,18 @@
-import duckdb
 import pytest
 from versus import ComparisonError, compare
 
 
 def rel_values(rel, column):
-    idx = rel.columns.index(column)
-    return [row[idx] for row in rel.fetchall()]
+    return [row[0] for row in rel.project(f'"{column}"').fetchall()]
 
 
 def rel_height(rel):
     return rel.aggregate("COUNT(*) AS n").fetchone()[0]
 
 
-@pytest.fixture
-def comparison_with_diffs():
-    con = duckdb.connect()
-    rel_a = con.sql(
+@pytest.fixture(scope="module")
+def comparison_with_diffs(duck):
+    rel_a = duck.sql(
         """
         SELECT
           *
@@ -28,7 +25,7 @@ def comparison_with_diffs():
           ) AS t(id, value, wind, note)
         """
     )
-    rel_b = con.sql(
+    rel_b = duck.sql(
         """
         SELECT
           *
@@ -41,10 +38,9 @@ def comparison_with_diffs():
           ) AS t(id, value, wind, note)
         """
     )
-    comp = compare(rel_a, rel_b, by=["id"], con=con)
+    comp = compare(rel_a, rel_b, by=["id"], con=duck)
     yield comp
     comp.close()
-    con.close()
 
 
 def test_value_diffs_reports_rows(comparison_with_diffs):
@@ -64,8 +60,7 @@ def test_value_diffs_stacked_empty_when_no_differences(comparison_with_diffs):
     assert rel_height(out) == 0
 
 
-def test_value_diffs_stacked_errors_when_no_value_columns():
-    con = duckdb.connect()
+def test_value_diffs_stacked_errors_when_no_value_columns(con):
     comp = compare(
         con.sql("SELECT * FROM (VALUES (1, 'x')) AS t(id, tag)"),
         con.sql("SELECT * FROM (VALUES (1, 'x')) AS t(id, tag)"),
@@ -74,8 +69,6 @@ def test_value_diffs_stacked_errors_when_no_value_columns():
     )
     with pytest.raises(ComparisonError):
         comp.value_diffs_stacked()
-    comp.close()
-    con.close()
 
 
 def test_value_diffs_errors_on_unknown_column(comparison_with_diffs):
@@ -89,8 +82,7 @@ def test_value_diffs_stacked_combines_columns(comparison_with_diffs):
     assert rel_height(out) == 2
 
 
-def test_value_diffs_stacked_handles_incompatible_types():
-    con = duckdb.connect()
+def test_value_diffs_stacked_handles_incompatible_types(con):
     comp = compare(
         con.sql(
             "SELECT * FROM (VALUES (1, 'a', 10), (2, 'b', 11)) AS t(id, alpha, beta)"
@@ -104,12 +96,9 @@ def test_value_diffs_stacked_handles_incompatible_types():
     )
     out = comp.value_diffs_stacked(["alpha", "beta"])
     assert set(rel_values(out, "column")) == {"alpha", "beta"}
-    comp.close()
-    con.close()
 
 
-def test_value_diffs_respects_custom_table_ids():
-    con = duckdb.connect()
+def test_value_diffs_respects_custom_table_ids(con):
     comp = compare(
         con.sql("SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)"),
         con.sql("SELECT * FROM (VALUES (1, 15), (2, 20)) AS t(id, value)"),
@@ -119,8 +108,6 @@ def test_value_diffs_respects_custom_table_ids():
     )
     out = comp.value_diffs("value")
     assert {"value_original", "value_updated"}.issubset(set(out.columns))
-    comp.close()
-    con.close()
 
 
 def test_value_diffs_rejects_multiple_columns(comparison_with_diffs):
@@ -136,3 +123,38 @@ def test_value_diffs_stacked_errors_on_unknown_column(comparison_with_diffs):
 def test_value_diffs_stacked_rejects_empty_selection(comparison_with_diffs):
     with pytest.raises(ComparisonError):
         comparison_with_diffs.value_diffs_stacked([])
+
+
+@pytest.mark.parametrize("materialize", ["all", "summary", "none"])
+def test_value_diffs_empty_structure_across_modes(con, materialize):
+    comp = compare(
+        con.sql("SELECT * FROM (VALUES (1, 'x'), (2, 'y')) AS t(id, note)"),
+        con.sql("SELECT * FROM (VALUES (1, 'x'), (2, 'y')) AS t(id, note)"),
+        by=["id"],
+        con=con,
+        materialize=materialize,
+    )
+    out = comp.value_diffs("note")
+    assert rel_height(out) == 0
+    assert out.columns == ["note_a", "note_b", "id"]
+    assert [str(dtype) for dtype in out.dtypes] == ["VARCHAR", "VARCHAR", "INTEGER"]
+
+
+def test_value_diffs_returns_independent_relations(comparison_with_diffs):
+    first = comparison_with_diffs.value_diffs("value")
+    second = comparison_with_diffs.value_diffs("value")
+    assert first.fetchone() == (20, 25, 2)
+    assert second.fetchone() == (20, 25, 2)
+
+
+@pytest.mark.parametrize("materialize", ["all", "summary", "none"])
+def test_value_diffs_matches_null_keys(con, materialize):
+    comp = compare(
+        con.sql("SELECT * FROM (VALUES (1, 10), (NULL, 20)) AS t(id, value)"),
+        con.sql("SELECT * FROM (VALUES (1, 10), (NULL, 25)) AS t(id, value)"),
+        by=["id"],
+        con=con,
+        materialize=materialize,
+    )
+    out = comp.value_diffs("value")
+    assert out.fetchall() == [(20, 25, None)]
@@ -1,29 +1,32 @@
-import duckdb
 import pytest
 from versus import ComparisonError, compare
 
+DEFAULT_TABLE_IDS = frozenset({"a", "b"})
+CUSTOM_TABLE_IDS = frozenset({"original", "updated"})
+
 
 def rel_values(rel, column):
-    idx = rel.columns.index(column)
-    return [row[idx] for row in rel.fetchall()]
+    return [row[0] for row in rel.project(f'"{column}"').fetchall()]
+
+
+def rel_distinct(rel, column):
+    return {row[0] for row in rel.project(f'"{column}"').distinct().fetchall()}
 
 
 def rel_height(rel):
     return rel.aggregate("COUNT(*) AS n").fetchone()[0]
 
 
-@pytest.fixture
-def comparison_for_weave():
-    con = duckdb.connect()
+@pytest.fixture(scope="module")
+def comparison_for_weave(duck):
     comp = compare(
-        con.sql("SELECT * FROM (VALUES (1, 10, 1), (2, 20, 1)) AS t(id, value, wind)"),
-        con.sql("SELECT * FROM (VALUES (1, 10, 2), (2, 25, 1)) AS t(id, value, wind)"),
+        duck.sql("SELECT * FROM (VALUES (1, 10, 1), (2, 20, 1)) AS t(id, value, wind)"),
+        duck.sql("SELECT * FROM (VALUES (1, 10, 2), (2, 25, 1)) AS t(id, value, wind)"),
         by=["id"],
-        con=con,
+        con=duck,
     )
     yield comp
     comp.close()
-    con.close()
 
 
 def test_weave_diffs_wide_has_expected_columns(comparison_for_weave):
@@ -33,7 +36,26 @@ def test_weave_diffs_wide_has_expected_columns(comparison_for_weave):
 
 def test_weave_diffs_long_contains_both_tables(comparison_for_weave):
     out = comparison_for_weave.weave_diffs_long(["value"])
-    assert set(rel_values(out, "table_name")) == {"a", "b"}
+    assert rel_distinct(out, "table_name") == DEFAULT_TABLE_IDS
+
+
+@pytest.mark.parametrize("materialize", ["all", "none"])
+def test_weave_diffs_wide_all_columns_matches_union_of_keys(con, materialize):
+    comp = compare(
+        con.sql(
+            "SELECT * FROM (VALUES (1, 10, 1), (2, 20, 1), (3, 30, 1)) "
+            "AS t(id, value, wind)"
+        ),
+        con.sql(
+            "SELECT * FROM (VALUES (1, 10, 2), (2, 25, 1), (3, 30, 1)) "
+            "AS t(id, value, wind)"
+        ),
+        by=["id"],
+        con=con,
+        materialize=materialize,
+    )
+    assert sorted(rel_values(comp.weave_diffs_wide(), "id")) == [1, 2]
+    assert rel_values(comp.weave_diffs_wide(["value"]), "id") == [2]
 
 
 def test_weave_diffs_wide_accepts_custom_suffix(comparison_for_weave):
@@ -41,6 +63,13 @@ def test_weave_diffs_wide_accepts_custom_suffix(comparison_for_weave):
     assert {"value_old", "value_new"}.issubset(set(out.columns))
 
 
+def test_weave_diffs_wide_suffix_is_per_call(comparison_for_weave):
+    custom = comparison_for_weave.weave_diffs_wide(["value"], suffix=("_old", "_new"))
+    default = comparison_for_weave.weave_diffs_wide(["value", "wind"])
+    assert custom.columns == ["id", "value_old", "value_new", "wind"]
+    assert default.columns == ["id", "value_a", "value_b", "wind_a", "wind_b"]
+
+
 def test_weave_diffs_wide_rejects_invalid_suffix(comparison_for_weave):
     with pytest.raises(ComparisonError):
         comparison_for_weave.weave_diffs_wide(["value"], suffix=("dup", "dup"))
@@ -53,8 +82,7 @@ def test_weave_diffs_wide_accepts_empty_suffix(comparison_for_weave):
     assert {"value", "value_new"}.issubset(set(out.columns))
 
 
-def test_weave_diffs_long_empty_when_no_differences():
-    con = duckdb.connect()
+def test_weave_diffs_long_empty_when_no_differences(con):
     comp = compare(
         con.sql("SELECT * FROM (VALUES (1, 10)) AS t(id, value)"),
         con.sql("SELECT * FROM (VALUES (1, 10)) AS t(id, value)"),
@@ -63,12 +91,9 @@ def test_weave_diffs_long_empty_when_no_differences():
     )
     out = comp.weave_diffs_long(["value"])
     assert rel_height(out) == 0
-    comp.close()
-    con.close()
 
 
-def test_weave_diffs_long_interleaves_rows():
-    con = duckdb.connect()
+def test_weave_diffs_long_interleaves_rows(con):
     comp = compare(
         con.sql("SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)"),
         con.sql("SELECT * FROM (VALUES (1, 11), (2, 25)) AS t(id, value)"),
@@ -78,12 +103,9 @@ def test_weave_diffs_long_interleaves_rows():
     out = comp.weave_diffs_long(["value"])
     assert rel_values(out, "table_name") == ["a", "b", "a", "b"]
     assert rel_values(out, "id") == [1, 1, 2, 2]
-    comp.close()
-    con.close()
 
 
-def test_weave_diffs_respects_custom_table_ids():
-    con = duckdb.connect()
+def test_weave_diffs_respects_custom_table_ids(con):
     comp = compare(
         con.sql("SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)"),
         con.sql("SELECT * FROM (VALUES (1, 15), (2, 20)) AS t(id, value)"),
@@ -94,6 +116,68 @@ def test_weave_diffs_respects_custom_table_ids():
     wide = comp.weave_diffs_wide(["value"])
     assert {"value_original", "value_updated"}.issubset(set(wide.columns))
     long = comp.weave_diffs_long(["value"])
-    assert set(rel_values(long, "table_name")) == {"original", "updated"}
-    comp.close()
-    con.close()
+    assert rel_distinct(long, "table_name") == CUSTOM_TABLE_IDS
+
+
+@pytest.mark.parametrize("materialize", ["all", "none"])
+def test_weave_diffs_long_quotes_table_ids(con, materialize):
+    comp = compare(
+        con.sql("SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)"),
+        con.sql("SELECT * FROM (VALUES (1, 15), (2, 20)) AS t(id, value)"),
+        by=["id"],
+        table_id=("it's", "b"),
+        con=con,
+        materialize=materialize,
+    )
+    long = comp.weave_diffs_long(["value"])
+    assert rel_values(long, "table_name") == ["it's", "b"]
+
+
+@pytest.mark.parametrize("materialize", ["all", "none"])
+def test_weave_diffs_long_uses_stacked_types(con, materialize):
+    comp = compare(
+        con.sql("SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)"),
+        con.sql(
+            "SELECT * FROM (VALUES (1, CAST(15 AS BIGINT)), (2, CAST(20 AS BIGINT))) "
+            "AS t(id, value)"
+        ),
+        by=["id"],
+        con=con,
+        materialize=materialize,
+    )
+    long = comp.weave_diffs_long(["value"])
+    assert [str(dtype) for dtype in long.dtypes] == ["VARCHAR", "INTEGER", "BIGINT"]
+    assert rel_values(long, "value") == [10, 15]
+
+
+@pytest.mark.parametrize("materialize", ["all", "none"])
+def test_weave_diffs_long_casts_by_columns_to_stacked_type(con, materialize):
+    comp = compare(
+        con.sql("SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(id, value)"),
+        con.sql(
+            "SELECT * FROM (VALUES (CAST(1 AS BIGINT), 15), (CAST(2 AS BIGINT), 20)) "
+            "AS t(id, value)"
+        ),
+        by=["id"],
+        con=con,
+        materialize=materialize,
+    )
+    long = comp.weave_diffs_long(["value"])
+    assert [str(dtype) for dtype in long.dtypes] == ["VARCHAR", "BIGINT", "INTEGER"]
+    assert rel_values(long, "id") == [1, 1]
+
+
+@pytest.mark.parametrize("materialize", ["all", "none"])
+def test_weave_long_unordered(con, materialize):
+    comp = compare(
+        con.sql("SELECT range AS id, range AS value FROM range(50)"),
+        con.sql("SELECT range AS id, range + 1 AS value FROM range(50)"),
+        by=["id"],
+        con=con,
+        materialize=materialize,
+    )
+    ordered = comp.weave_diffs_long(["value"]).fetchall()
+    unordered = comp.weave_diffs_long(["value"], ordered=False).fetchall()
+    assert sorted(unordered) == sorted(ordered)
+    assert [row[0] for row in unordered] == ["a", "b"] * 50
+    assert [row[1] for row in unordered[::2]] == [row[1] for row in unordered[1::2]]